@@ -1,30 +1,283 @@
 import os
 import sys
-import glob
-import json
 import tempfile
+import hashlib
+import importlib.util
 import subprocess
 import shutil
-import time
-from PyQt5.QtWidgets import *
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtGui import QFont, QIcon, QColor
-from bs4 import BeautifulSoup
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from PyQt5.QtWidgets import (
+    QApplication, QFileDialog, QGroupBox, QHBoxLayout, QLabel, QLineEdit,
+    QListWidget, QMainWindow, QPushButton, QTextEdit, QVBoxLayout, QWidget
+)
+from PyQt5.QtCore import Qt, QProcess, QProcessEnvironment, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont
 
 # Configuración inicial
 FONT_NAME = "MyCustomFont"
 ICON_COLOR = "#3498db"
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mvr", "fonts")
+CACHE_MAX_BYTES = 200 * 1024 * 1024  # Al superarlo se borran las fuentes menos usadas
+LOG_FLUSH_MS = 50
+SHARD_MIN_FILES = 50  # Por debajo de esto no compensa lanzar otro FontForge
+
+
+# Hoja de estilos de la aplicación; solo depende de constantes, se construye una vez
+STYLESHEET = f"""
+    QMainWindow {{
+        background-color: #2c3e50;
+        color: #ecf0f1;
+    }}
+    QWidget {{
+        background-color: #2c3e50;
+        color: #ecf0f1;
+        font-family: 'Segoe UI';
+    }}
+    QPushButton {{
+        background-color: {ICON_COLOR};
+        color: white;
+        border-radius: 5px;
+        padding: 8px;
+        font-weight: bold;
+    }}
+    QPushButton:hover {{
+        background-color: #2980b9;
+    }}
+    QLineEdit, QListWidget {{
+        background-color: #34495e;
+        color: #ecf0f1;
+        border: 1px solid {ICON_COLOR};
+        border-radius: 5px;
+        padding: 5px;
+    }}
+    QLabel {{
+        font-weight: bold;
+        font-size: 12px;
+    }}
+    QGroupBox {{
+        border: 1px solid {ICON_COLOR};
+        border-radius: 8px;
+        margin-top: 10px;
+        font-weight: bold;
+        padding-top: 15px;
+    }}
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        subcontrol-position: top center;
+        padding: 0 5px;
+    }}
+    QTextEdit {{
+        background-color: #1e2a38;
+        color: #bdc3c7;
+        border: 1px solid #34495e;
+        border-radius: 5px;
+    }}
+"""
+
+# Scripts de FontForge, construidos una sola vez. Reciben la lista de archivos
+# y la ruta de salida por las variables de entorno FONT_FILES y FONT_OUT.
+FONTFORGE_SCRIPT = textwrap.dedent(f"""
+    # Crea una fuente desde archivos SVG con nombres como 'a.svg' o 'b.svg'
+    New()
+
+    # Configurar metadatos de la fuente
+    SetFontNames("{FONT_NAME}", "{FONT_NAME}", "{FONT_NAME}", "Regular")
+    SetTTFName(0x409, 1, "{FONT_NAME}")
+    SetTTFName(0x409, 2, "Regular")
+    SetTTFName(0x409, 3, "{FONT_NAME}")
+    SetTTFName(0x409, 4, "{FONT_NAME}")
+    SetTTFName(0x409, 5, "Version 1.0")
+
+    # Configurar unidades
+    ScaleToEm(1000)
+
+    # Archivos SVG a importar, uno por línea
+    files = StrSplit(LoadStringFromFile(GetEnv("FONT_FILES")), "\\n")
+
+    # Iterar sobre la lista de archivos
+    i = 0
+    while (i < SizeOf(files))
+        Open(files[i])
+        SelectAll()
+        Copy()
+        Close()
+
+        # Obtener el nombre base del archivo (sin extensión)
+        filename = FileName(files[i])
+        base = FileBaseName(filename)
+
+        # Obtener código Unicode del primer carácter del nombre
+        Select(CharToUnicode(substr(base, 0, 1)))
+        Paste()
+        SetWidth(600)
+        SelectNone()
+        i++
+    endloop
+
+    # Guardar la fuente
+    Generate(GetEnv("FONT_OUT"))
+    Close()
+    Quit(0)
+""")
+
+# Une las fuentes parciales listadas en FONT_FILES en la fuente final
+MERGE_SCRIPT = textwrap.dedent("""
+    fonts = StrSplit(LoadStringFromFile(GetEnv("FONT_FILES")), "\\n")
+    Open(fonts[0])
+    i = 1
+    while (i < SizeOf(fonts))
+        MergeFonts(fonts[i])
+        i++
+    endloop
+    Generate(GetEnv("FONT_OUT"))
+    Close()
+    Quit(0)
+""")
+
+
+class TagNameCollector(HTMLParser):
+    """Recolecta los nombres de etiqueta sin construir un árbol (respaldo sin lxml)"""
+    def __init__(self):
+        super().__init__()
+        self.tags = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag:
+            self.tags.add(tag)
+
+
+def scan_tag_names(path):
+    """Devuelve el conjunto (inmutable) de etiquetas de un archivo HTML en una sola pasada,
+    sin nombres vacíos"""
+    # Importación diferida: no cargar lxml hasta que se abra un archivo
+    try:
+        from lxml import etree
+    except ImportError:
+        etree = None
+
+    if etree is not None:
+        tags = set()
+        try:
+            for event, el in etree.iterparse(path, events=('start', 'end'), html=True, encoding='utf-8'):
+                if event == 'start':
+                    if el.tag:
+                        tags.add(el.tag)
+                else:
+                    # Vaciar el elemento y soltar los hermanos ya procesados, para
+                    # que un <body> largo y plano no acumule un nodo por elemento
+                    el.clear()
+                    while el.getprevious() is not None:
+                        del el.getparent()[0]
+        except etree.XMLSyntaxError:
+            # Un archivo vacío (o sin elementos) no es un error: no tiene etiquetas
+            if tags:
+                raise
+        return frozenset(tags)
+
+    collector = TagNameCollector()
+    with open(path, 'r', encoding='utf-8') as f:
+        for chunk in iter(lambda: f.read(65536), ''):
+            collector.feed(chunk)
+    collector.close()
+    return frozenset(collector.tags)
+
+
+def list_svg_files(folder):
+    """Lista los SVG de una carpeta usando os.scandir (evita stats repetidos).
+    Como glob, ignora los archivos ocultos (p. ej. los '._a.svg' de macOS)"""
+    with os.scandir(folder) as entries:
+        return [e.path for e in entries
+                if not e.name.startswith('.') and e.is_file() and e.name.lower().endswith('.svg')]
+
+
+def glyph_key(path):
+    """Carácter al que el script asigna un SVG: el primero de su nombre"""
+    return os.path.basename(path)[:1]
+
+
+def split_shards(files):
+    """Reparte los archivos en un grupo por núcleo si hay al menos SHARD_MIN_FILES por grupo.
+    Los SVG del mismo carácter van siempre al mismo grupo: dentro de él se conserva
+    el orden y gana el último, igual que sin grupos (MergeFonts no reemplaza glifos).
+    El grupo depende solo del carácter, no de la posición en la lista, así que añadir
+    o editar un SVG solo invalida en la caché el grupo que lo contiene"""
+    count = os.cpu_count() or 1
+    if len(files) < count * SHARD_MIN_FILES:
+        return [files]
+    shards = [[] for _ in range(count)]
+    for path in files:
+        h = hashlib.blake2b(glyph_key(path).encode('utf-8'), digest_size=8)
+        shards[int.from_bytes(h.digest(), 'big') % count].append(path)
+    return [shard for shard in shards if shard]
+
+
+def file_digest(path):
+    """Huella de un SVG: el nombre decide el carácter asignado, así que también cuenta"""
+    h = hashlib.blake2b(os.path.basename(path).encode('utf-8'), digest_size=20)
+    with open(path, 'rb') as f:
+        h.update(f.read())
+    return h.digest()
+
+
+def content_hash(digests, script):
+    """Huella de un grupo de SVG (y del script que los procesa) para la caché"""
+    h = hashlib.blake2b(script.encode('utf-8'), digest_size=20)
+    for digest in digests:
+        h.update(digest)
+    return h.hexdigest()
+
+
+def prune_cache():
+    """Borra las entradas de la caché usadas hace más tiempo hasta quedar bajo CACHE_MAX_BYTES"""
+    with os.scandir(CACHE_DIR) as entries:
+        files = [(e.stat().st_mtime, e.stat().st_size, e.path)
+                 for e in entries if e.is_file() and e.name.endswith('.ttf')]
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= CACHE_MAX_BYTES:
+            break
+        os.remove(path)
+        total -= size
+
+
+def compute_cache_keys(svg_files, shards):
+    """Claves de caché de la fuente completa y de cada parte; cada SVG se lee una sola vez"""
+    digests = {path: file_digest(path) for path in svg_files}
+    font_key = content_hash((digests[p] for p in svg_files), FONTFORGE_SCRIPT)
+    shard_keys = [content_hash((digests[p] for p in shard), FONTFORGE_SCRIPT) for shard in shards]
+    return font_key, shard_keys
+
 
 class FontGeneratorApp(QMainWindow):
+    _fontforge_path = None  # None: aún no buscado; "": no encontrado
+    # Emitida desde el hilo de cálculo de huellas; Qt la entrega en el hilo de la interfaz
+    cache_keys_ready = pyqtSignal(str, list, list, object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Generador de Fuentes Personalizadas")
         self.setGeometry(100, 100, 900, 600)
-        self.setStyleSheet(self.get_stylesheet())
+        self.setStyleSheet(STYLESHEET)
 
         self.svg_folder = ""
+        self.svg_files = []
+        self._svg_folder_mtime = None
         self.html_file = ""
-        self.temp_dir = tempfile.mkdtemp()
+        self._soup = None
+        self._soup_key = None  # (ruta, mtime_ns, tamaño) del HTML analizado en self._soup
+        self.temp_dir = None  # Se crea al generar la primera fuente
+        self.font_procs = []
+        self.font_running = False  # Hay una generación en curso
+        self._hash_pool = ThreadPoolExecutor(max_workers=1)
+        self._closing = False
+        self.cache_keys_ready.connect(self._start_font_jobs)
+        self._log_buf = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(LOG_FLUSH_MS)
+        self._log_timer.timeout.connect(self.flush_log)
 
         self.init_ui()  # Inicializar la UI primero, define self.console
 
@@ -32,100 +285,100 @@ class FontGeneratorApp(QMainWindow):
         self.check_dependencies()
 
         
-    def get_stylesheet(self):
-        return f"""
-            QMainWindow {{
-                background-color: #2c3e50;
-                color: #ecf0f1;
-            }}
-            QWidget {{
-                background-color: #2c3e50;
-                color: #ecf0f1;
-                font-family: 'Segoe UI';
-            }}
-            QPushButton {{
-                background-color: {ICON_COLOR};
-                color: white;
-                border-radius: 5px;
-                padding: 8px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: #2980b9;
-            }}
-            QLineEdit, QListWidget {{
-                background-color: #34495e;
-                color: #ecf0f1;
-                border: 1px solid {ICON_COLOR};
-                border-radius: 5px;
-                padding: 5px;
-            }}
-            QLabel {{
-                font-weight: bold;
-                font-size: 12px;
-            }}
-            QGroupBox {{
-                border: 1px solid {ICON_COLOR};
-                border-radius: 8px;
-                margin-top: 10px;
-                font-weight: bold;
-                padding-top: 15px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top center;
-                padding: 0 5px;
-            }}
-            QTextEdit {{
-                background-color: #1e2a38;
-                color: #bdc3c7;
-                border: 1px solid #34495e;
-                border-radius: 5px;
-            }}
-        """
-        
     def find_fontforge(self):
-        # Buscar FontForge en las ubicaciones comunes
-        possible_paths = [
-            "/usr/bin/fontforge",
-            "/usr/local/bin/fontforge",
-            "C:/Program Files (x86)/FontForgeBuilds/bin/fontforge.exe",
-            "C:/Program Files/FontForgeBuilds/bin/fontforge.exe"
-        ]
-        
-        for path in possible_paths:
-            if os.path.exists(path):
-                self.log_message(f"✅ FontForge encontrado en: {path}")
-                return path
+        # El resultado se guarda en la clase: la búsqueda solo se hace una vez
+        if FontGeneratorApp._fontforge_path is None:
+            # Buscar primero en el PATH y luego en las ubicaciones comunes
+            possible_paths = [
+                "/usr/bin/fontforge",
+                "/usr/local/bin/fontforge",
+                "C:/Program Files (x86)/FontForgeBuilds/bin/fontforge.exe",
+                "C:/Program Files/FontForgeBuilds/bin/fontforge.exe"
+            ]
+            FontGeneratorApp._fontforge_path = (
+                shutil.which("fontforge")
+                or shutil.which("fontforge.exe")
+                or next((p for p in possible_paths if os.path.isfile(p)), "")
+            )
+
+        path = FontGeneratorApp._fontforge_path
+        if path:
+            self.log_message(f"✅ FontForge encontrado en: {path}")
+            return path
                 
         self.log_message("⚠️ FontForge no encontrado. Necesario para generar fuentes.")
         return None
         
     def check_dependencies(self):
-        try:
-            from bs4 import BeautifulSoup
+        # find_spec solo busca el módulo, no lo ejecuta
+        if importlib.util.find_spec("bs4") is not None:
             self.log_message("✅ BeautifulSoup4 está instalado")
-        except ImportError:
+        else:
             self.log_message("⚠️ Instalando BeautifulSoup4...")
             subprocess.check_call([sys.executable, "-m", "pip", "install", "beautifulsoup4"])
+        # lxml es opcional: sin él se usa html.parser, más lento
+        if importlib.util.find_spec("lxml") is not None:
+            self.log_message("✅ lxml está instalado")
+        else:
+            self.log_message("⚠️ lxml no está instalado: se usará html.parser (más lento)")
+
+    def parse_html(self, content):
+        from bs4 import BeautifulSoup  # Importación diferida
+
+        # Este árbol se vuelve a escribir en disco: html.parser conserva los bloques
+        # PHP y no envuelve los fragmentos en <html>/<body> como hace lxml
+        return BeautifulSoup(content, 'html.parser')
+
+    def html_file_key(self):
+        # El tamaño cubre los sistemas de archivos con mtime de baja resolución
+        target = os.path.realpath(self.html_file)
+        st = os.stat(target)
+        return (target, st.st_mtime_ns, st.st_size)
+
+    def get_soup(self):
+        # Reutilizar el árbol si el archivo no cambió desde el último análisis
+        key = self.html_file_key()
+        if self._soup is None or self._soup_key != key:
+            with open(self.html_file, 'r', encoding='utf-8') as f:
+                self._soup = self.parse_html(f.read())
+            self._soup_key = key
+        return self._soup
             
     def log_message(self, message):
-        self.console.append(message)
-        QApplication.processEvents()
+        # Acumular mensajes y volcarlos juntos cada LOG_FLUSH_MS, en lugar de
+        # repintar la consola con cada línea
+        self._log_buf.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def flush_log(self):
+        if self._log_buf:
+            self.console.append("\n".join(self._log_buf))
+            self._log_buf.clear()
         
     def select_svg_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Seleccionar Carpeta SVG")
         if folder:
-            svg_files = glob.glob(os.path.join(folder, "*.svg"))
+            svg_files = list_svg_files(folder)
             if svg_files:
                 self.svg_folder = folder
+                self.svg_files = sorted(svg_files)
+                self._svg_folder_mtime = os.stat(folder).st_mtime
                 self.svg_path_edit.setText(folder)
-                self.generate_btn.setEnabled(bool(self.fontforge_path))
+                self.generate_btn.setEnabled(bool(self.fontforge_path) and not self.font_running)
                 self.log_message(f"📂 Carpeta SVG seleccionada: {folder} ({len(svg_files)} archivos)")
             else:
                 self.log_message("❌ No se encontraron archivos SVG en la carpeta")
                 self.generate_btn.setEnabled(False)
                 
+    def get_svg_files(self):
+        # Volver a listar solo si la carpeta cambió desde que se seleccionó
+        mtime = os.stat(self.svg_folder).st_mtime
+        if mtime != self._svg_folder_mtime:
+            self.svg_files = sorted(list_svg_files(self.svg_folder))
+            self._svg_folder_mtime = mtime
+        return self.svg_files
+
     def select_html_file(self):
         file, _ = QFileDialog.getOpenFileName(
             self, 
@@ -140,25 +393,29 @@ class FontGeneratorApp(QMainWindow):
             self.log_message(f"📄 Archivo seleccionado: {file}")
             
     def load_html_tags(self):
+        # Sin repintados intermedios mientras se vacía y se vuelve a llenar la lista
+        self.tags_list.setUpdatesEnabled(False)
         self.tags_list.clear()
         try:
-            with open(self.html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                soup = BeautifulSoup(content, 'html.parser')
-                tags = set([tag.name for tag in soup.find_all()])
-                
-                for tag in sorted(tags):
-                    if len(tag) > 0:
-                        self.tags_list.addItem(tag)
-                        
-                self.modify_btn.setEnabled(True)
-                self.log_message(f"🏷️ Etiquetas encontradas: {len(tags)}")
-                
+            # Solo interesan los nombres: recorrer el archivo sin construir el DOM
+            tags = scan_tag_names(self.html_file)
+
+            # Inserción en bloque: una sola actualización del modelo
+            self.tags_list.addItems(sorted(tags))
+
+            self.modify_btn.setEnabled(True)
+            self.log_message(f"🏷️ Etiquetas encontradas: {len(tags)}")
+
         except Exception as e:
             self.log_message(f"❌ Error al cargar archivo: {str(e)}")
             self.modify_btn.setEnabled(False)
+        finally:
+            self.tags_list.setUpdatesEnabled(True)
             
     def generate_font(self):
+        if self.font_running:
+            self.log_message("❌ Ya se está generando una fuente")
+            return
         if not self.svg_folder:
             self.log_message("❌ Primero selecciona una carpeta SVG")
             return
@@ -174,72 +431,178 @@ class FontGeneratorApp(QMainWindow):
             return
             
         self.log_message("⏳ Generando fuente...")
-        QApplication.processEvents()
-        
+
         try:
-            # Crear archivo de script de FontForge corregido
-            script_path = os.path.join(self.temp_dir, "generate_font.pe")
-            with open(script_path, 'w') as f:
-                f.write(self.generate_fontforge_script(output_file))
-            
-            svg_files = sorted(glob.glob(os.path.join(self.svg_folder, "*.svg")))
-            result = subprocess.run(
-                [self.fontforge_path, "-script", script_path] + svg_files,
-                capture_output=True,
-                text=True
-            )
+            # La lista de SVG va en un archivo aparte que lee el script: con miles
+            # de archivos la línea de comandos superaría el límite del sistema
+            svg_files = self.get_svg_files()
+            shards = split_shards(svg_files)
 
-            
-            if result.returncode == 0:
-                self.log_message(f"✅ Fuente generada exitosamente: {output_file}")
-                self.log_message("⚠️ Nota: Los archivos SVG deben tener nombres Unicode (ej: U+0041.svg)")
+            self.font_running = True
+            self.generate_btn.setEnabled(False)
+            # Leer todos los SVG para la caché puede tardar: fuera del hilo de la interfaz
+            future = self._hash_pool.submit(compute_cache_keys, svg_files, shards)
+            future.add_done_callback(
+                lambda f: self.cache_keys_ready.emit(output_file, svg_files, shards, f))
+
+        except Exception as e:
+            self.log_message(f"❌ Error crítico: {str(e)}")
+
+    def _start_font_jobs(self, output_file, svg_files, shards, future):
+        if self._closing:
+            return
+        try:
+            font_key, shard_keys = future.result()
+
+            self._font_output = output_file
+            self._font_failed = False
+            self._font_error = None
+            self._merge_job = None
+
+            # Si ningún SVG cambió desde la última vez, reutilizar la fuente en caché
+            cached_font = os.path.join(CACHE_DIR, font_key + ".ttf")
+            if os.path.isfile(cached_font):
+                os.utime(cached_font)  # Marcar como usada recientemente
+                shutil.copyfile(cached_font, output_file)
+                self.log_message(f"✅ Fuente generada exitosamente (sin cambios, desde caché): {output_file}")
+                self._finish_font_run()
+                return
+            self._cache_copies = [(output_file, cached_font)]
+
+            self._ensure_tempdir()
+            font_script = self.write_script("generate_font.pe", FONTFORGE_SCRIPT)
+            if len(shards) == 1:
+                jobs = [(font_script, self.write_file_list("generate_font.txt", svg_files), output_file)]
             else:
-                self.log_message(f"❌ Error al generar fuente: {result.stderr}")
-                
+                # FontForge usa un solo núcleo: generar fuentes parciales en paralelo.
+                # Las partes cuyo contenido no cambió se toman de la caché.
+                shard_fonts = []
+                jobs = []
+                for i, (shard, shard_key) in enumerate(zip(shards, shard_keys)):
+                    cached_shard = os.path.join(CACHE_DIR, shard_key + ".ttf")
+                    if os.path.isfile(cached_shard):
+                        os.utime(cached_shard)
+                        shard_fonts.append(cached_shard)
+                        continue
+                    shard_font = os.path.join(self.temp_dir, f"shard{i}.ttf")
+                    shard_fonts.append(shard_font)
+                    self._cache_copies.append((shard_font, cached_shard))
+                    jobs.append((font_script, self.write_file_list(f"shard{i}.txt", shard), shard_font))
+                merge_job = (self.write_script("merge.pe", MERGE_SCRIPT),
+                             self.write_file_list("merge.txt", shard_fonts), output_file)
+                self.log_message(f"   Procesando {len(svg_files)} SVG en {len(shards)} partes "
+                                 f"({len(shards) - len(jobs)} desde caché)")
+                if jobs:
+                    self._merge_job = merge_job
+                else:
+                    jobs = [merge_job]
+
+            # QProcess no bloquea la interfaz: la salida llega por señales
+            self._pending_procs = len(jobs)
+            for job in jobs:
+                self.start_fontforge(*job)
+
         except Exception as e:
             self.log_message(f"❌ Error crítico: {str(e)}")
-            
-    def generate_fontforge_script(self, output_file):
-            """Genera un script de FontForge que crea una fuente desde archivos SVG con nombres como 'a.svg' o 'b.svg'"""
-            return f"""
-        # Crear una nueva fuente
-        New()
-
-        # Configurar metadatos de la fuente
-        SetFontNames("{FONT_NAME}", "{FONT_NAME}", "{FONT_NAME}", "Regular")
-        SetTTFName(0x409, 1, "{FONT_NAME}")
-        SetTTFName(0x409, 2, "Regular")
-        SetTTFName(0x409, 3, "{FONT_NAME}")
-        SetTTFName(0x409, 4, "{FONT_NAME}")
-        SetTTFName(0x409, 5, "Version 1.0")
-
-        # Configurar unidades
-        ScaleToEm(1000)
-
-        # Iterar sobre los archivos pasados como argumentos
-        foreach($argv)
-            Open($1)
-            SelectAll()
-            Copy()
-            Close()
-
-            # Obtener el nombre base del archivo (sin extensión)
-            filename = FileName($1)
-            base = FileBaseName(filename)
-
-            # Obtener código Unicode del primer carácter del nombre
-            Select(CharToUnicode(substr(base, 0, 1)))
-            Paste()
-            SetWidth(600)
-            SelectNone()
-        endloop
-
-        # Guardar la fuente
-        Generate("{output_file.replace('\\\\', '/')}")
-        Close()
-        Quit(0)
-        """
+            self._finish_font_run()
+
+    def _finish_font_run(self):
+        self.font_running = False
+        self.generate_btn.setEnabled(True)
+
+    def _ensure_tempdir(self):
+        if not self.temp_dir:
+            self.temp_dir = tempfile.mkdtemp()
+        return self.temp_dir
+
+    def write_script(self, name, text):
+        # Los scripts no cambian entre ejecuciones: escribirlos una sola vez
+        script_path = os.path.join(self.temp_dir, name)
+        if not os.path.isfile(script_path):
+            with open(script_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return script_path
+
+    def write_file_list(self, name, files):
+        list_path = os.path.join(self.temp_dir, name)
+        # newline='\n': en Windows el modo texto escribiría '\r\n' y el script
+        # separa solo por '\n', dejando un '\r' al final de cada ruta
+        with open(list_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write("\n".join(path.replace('\\', '/') for path in files))
+        return list_path
+
+    def start_fontforge(self, script_path, list_path, output_file):
+        # Los scripts leen sus parámetros de variables de entorno
+        env = QProcessEnvironment.systemEnvironment()
+        env.insert("FONT_FILES", list_path)
+        env.insert("FONT_OUT", output_file)
+
+        proc = QProcess(self)
+        proc.setProcessEnvironment(env)
+        proc.setProcessChannelMode(QProcess.MergedChannels)
+        proc.readyReadStandardOutput.connect(lambda: self.log_fontforge_output(proc))
+        proc.finished.connect(lambda code, status: self._on_font_done(proc, code, status))
+        proc.errorOccurred.connect(lambda error: self._on_font_error(proc, error))
+        self.font_procs.append(proc)
+        proc.start(self.fontforge_path, ["-script", script_path])
+
+    def log_fontforge_output(self, proc):
+        output = bytes(proc.readAllStandardOutput()).decode('utf-8', errors='replace').rstrip()
+        if output:
+            self.log_message(output)
 
+    def store_in_cache(self, copies):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            for src, dst in copies:
+                # Copiar a un temporal y reemplazar de forma atómica: una copia
+                # interrumpida nunca debe quedar como una entrada válida
+                fd, tmp_file = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+                os.close(fd)
+                try:
+                    shutil.copyfile(src, tmp_file)
+                    os.replace(tmp_file, dst)
+                except OSError:
+                    os.remove(tmp_file)
+                    raise
+            prune_cache()
+        except OSError as e:
+            self.log_message(f"⚠️ No se pudo guardar en caché: {str(e)}")
+
+    def _on_font_error(self, proc, error):
+        # Si el proceso no llega a arrancar, finished nunca se emite
+        if error == QProcess.FailedToStart:
+            self._on_font_done(proc, -1, QProcess.CrashExit)
+
+    def _on_font_done(self, proc, exit_code, exit_status):
+        self.font_procs.remove(proc)
+        proc.deleteLater()
+        if (exit_status != QProcess.NormalExit or exit_code != 0) and not self._font_failed:
+            # Informar del primer fallo, no del último proceso en terminar
+            self._font_failed = True
+            if exit_status != QProcess.NormalExit:
+                self._font_error = "FontForge no se pudo ejecutar o terminó inesperadamente"
+            else:
+                self._font_error = f"FontForge terminó con código {exit_code}"
+
+        self._pending_procs -= 1
+        if self._pending_procs > 0:
+            return
+
+        if not self._font_failed and self._merge_job:
+            # Todas las partes listas: unirlas en la fuente final
+            merge_job, self._merge_job = self._merge_job, None
+            self._pending_procs = 1
+            self.start_fontforge(*merge_job)
+            return
+
+        if self._font_failed:
+            self.log_message(f"❌ Error al generar fuente: {self._font_error}")
+        else:
+            self.store_in_cache(self._cache_copies)
+            self.log_message(f"✅ Fuente generada exitosamente: {self._font_output}")
+            self.log_message("⚠️ Nota: Los archivos SVG deben tener nombres Unicode (ej: U+0041.svg)")
+        self._finish_font_run()
             
     def modify_html(self):
         if not self.html_file:
@@ -251,13 +614,11 @@ class FontGeneratorApp(QMainWindow):
             self.log_message("❌ Selecciona al menos una etiqueta")
             return
         backup_file = None  # Definirlo antes por seguridad
+        tmp_file = None
 
         try:
             # Leer y modificar el HTML
-            with open(self.html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = self.get_soup()
 
             # Agregar CSS embebido
             css = f"""
@@ -281,16 +642,33 @@ class FontGeneratorApp(QMainWindow):
                 head_tag.append(style_tag)
                 soup.html.insert(0, head_tag)
 
+            # Si el archivo es un enlace simbólico, se trabaja sobre su destino
+            target = os.path.realpath(self.html_file)
+
             # Crear backup
             backup_dir = os.path.join(os.path.dirname(self.html_file), "backups")
             os.makedirs(backup_dir, exist_ok=True)
             base_name = os.path.basename(self.html_file)
             backup_file = os.path.join(backup_dir, base_name)
-            shutil.copy2(self.html_file, backup_file)
+            # El original se reemplaza por otro archivo, así que basta un enlace duro
+            if os.path.lexists(backup_file):
+                os.remove(backup_file)
+            try:
+                os.link(target, backup_file)
+            except OSError:
+                shutil.copyfile(self.html_file, backup_file)
 
-            # Guardar el HTML modificado
-            with open(self.html_file, 'w', encoding='utf-8') as f:
-                f.write(str(soup))
+            # Guardar el HTML modificado en un temporal y reemplazar de forma atómica:
+            # si el proceso se interrumpe, el original queda intacto
+            # Serializar directamente a bytes, sin pasar por un str intermedio
+            fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(soup.encode('utf-8'))
+            shutil.copymode(target, tmp_file)
+            os.replace(tmp_file, target)
+            tmp_file = None
+            # El árbol modificado coincide con el disco: sirve para el próximo cambio
+            self._soup_key = self.html_file_key()
 
             self.log_message(f"✅ Archivo modificado: {self.html_file}")
             self.log_message(f"   Etiquetas actualizadas: {', '.join(selected_tags)}")
@@ -299,6 +677,10 @@ class FontGeneratorApp(QMainWindow):
                 self.log_message(f"   Se creó un backup en: {backup_file}")
 
         except Exception as e:
+            # El árbol pudo quedar modificado sin guardarse
+            self._soup = None
+            if tmp_file and os.path.exists(tmp_file):
+                os.remove(tmp_file)
             self.log_message(f"❌ Error al modificar archivo: {str(e)}")
 
             
@@ -390,11 +772,18 @@ class FontGeneratorApp(QMainWindow):
         
     def closeEvent(self, event):
         # Limpieza al cerrar
-        try:
-            import shutil
-            shutil.rmtree(self.temp_dir)
-        except:
-            pass
+        self._closing = True
+        self._font_failed = True  # Evita lanzar la unión tras matar los procesos
+        self._font_error = "generación cancelada al cerrar"
+        self._hash_pool.shutdown(wait=False)
+        for proc in list(self.font_procs):
+            proc.kill()
+            proc.waitForFinished(1000)
+        if self.temp_dir:
+            try:
+                shutil.rmtree(self.temp_dir)
+            except:
+                pass
         event.accept()
 
 if __name__ == "__main__":